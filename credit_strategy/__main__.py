@@ -2,6 +2,7 @@
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
@@ -44,6 +45,16 @@ To get your cookie:
         default=None,
         help="Output Excel file path (default: output/credit_strategy_S{semester}.xlsx)"
     )
+    parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Only print warnings and errors"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore module details cached by previous runs"
+    )
     parser.add_argument(
         "--version", "-v",
         action="version",
@@ -52,18 +63,20 @@ To get your cookie:
 
     args = parser.parse_args()
 
-    print("=" * 60)
-    print("Credit Strategy Tool - Epitech Timeline Generator")
-    print("=" * 60)
+    log = (lambda *a, **k: None) if args.quiet else print
+
+    log("=" * 60)
+    log("Credit Strategy Tool - Epitech Timeline Generator")
+    log("=" * 60)
 
     # Initialize API
-    api = EpitechAPI(args.cookie)
+    api = EpitechAPI(args.cookie, use_cache=not args.no_cache, verbose=not args.quiet)
 
     # Test connection and get modules list
-    print("\nConnecting to intranet...")
+    log("\nConnecting to intranet...")
     try:
         raw_modules = api.get_modules_list()
-        print(f"  Connection OK - {len(raw_modules)} modules found")
+        log(f"  Connection OK - {len(raw_modules)} modules found")
     except requests.exceptions.HTTPError as e:
         print(f"  HTTP ERROR {e.response.status_code}: {e.response.reason}")
         if e.response.status_code == 403:
@@ -78,12 +91,12 @@ To get your cookie:
         sys.exit(1)
 
     # Fetch user info
-    print("\nFetching user info...")
+    log("\nFetching user info...")
     try:
         user_info = api.get_user_info()
         year_credits = user_info.credits % 60  # Credits for current year
-        print(f"  {user_info.name} - Year {user_info.student_year} (Promo {user_info.promo})")
-        print(f"  Total credits: {user_info.credits} | This year: {year_credits}/60 | GPA: {user_info.gpa}")
+        log(f"  {user_info.name} - Year {user_info.student_year} (Promo {user_info.promo})")
+        log(f"  Total credits: {user_info.credits} | This year: {year_credits}/60 | GPA: {user_info.gpa}")
     except Exception as e:
         print(f"  Warning: Could not fetch user info: {e}")
         user_info = None
@@ -92,54 +105,72 @@ To get your cookie:
     if args.semester is None:
         semesters = {m.get("semester") for m in raw_modules if m.get("semester")}
         args.semester = max(semesters) if semesters else 1
-        print(f"  Auto-detected latest semester: {args.semester}")
+        log(f"  Auto-detected latest semester: {args.semester}")
 
     # Calculate year from semester (S1-S2 = Year 1, S3-S4 = Year 2, etc.)
     # Year = (semester + 1) // 2
     # First semester of that year: (year - 1) * 2 + 1
     # Second semester of that year: (year - 1) * 2 + 2
-    year_credits_data = {}
     semester_year = (args.semester + 1) // 2  # Year based on requested semester
-    if user_info:
-        first_sem = (semester_year - 1) * 2 + 1
-        second_sem = first_sem + 1
+    first_sem = (semester_year - 1) * 2 + 1
+    second_sem = first_sem + 1
 
-        print(f"\nFetching year {semester_year} credits (S{first_sem}-S{second_sem})...")
-
-        # Always fetch first semester of the year
-        print(f"  Scanning S{first_sem}...", end=" ", flush=True)
-        s1_data = api.fetch_semester_credits(first_sem)
-        year_credits_data[first_sem] = s1_data
-        print(f"validated={s1_data['validated']}, pending={s1_data['pending']}")
-
-        # Fetch second semester only if we're in it (current semester >= second_sem)
-        if args.semester >= second_sem:
-            print(f"  Scanning S{second_sem}...", end=" ", flush=True)
-            s2_data = api.fetch_semester_credits(second_sem)
-            year_credits_data[second_sem] = s2_data
-            print(f"validated={s2_data['validated']}, pending={s2_data['pending']}")
+    # Always scan the first semester of the year, the second only if we're in it
+    year_semesters = []
+    if user_info:
+        year_semesters = [first_sem, second_sem] if args.semester >= second_sem else [first_sem]
+
+    # Scan year credits in the background while the timeline modules load.
+    # The requested semester is scanned afterwards to reuse the timeline's details.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        credit_scans = {
+            sem: pool.submit(api.fetch_semester_credits, sem)
+            for sem in year_semesters if sem != args.semester
+        }
+
+        try:
+            modules = api.fetch_all_modules(args.semester)
+
+            if not modules:
+                print(f"\nNo modules found for semester {args.semester}")
+                sys.exit(0)
+
+            year_credits_data = {}
+            if year_semesters:
+                log(f"\nFetching year {semester_year} credits (S{first_sem}-S{second_sem})...")
+
+            for sem in year_semesters:
+                log(f"  Scanning S{sem}...", end=" ", flush=True)
+                scan = credit_scans.get(sem)
+                sem_data = scan.result() if scan else api.fetch_semester_credits(sem)
+                year_credits_data[sem] = sem_data
+                log(f"validated={sem_data['validated']}, pending={sem_data['pending']}")
+        except BaseException:
+            # Leaving the pool waits for running scans: cancel their queued
+            # requests so an early exit (no modules, Ctrl-C) is not held up
+            for scan in credit_scans.values():
+                scan.cancel()
+            api.close()
+            raise
 
     # Set output path now that we know the semester
     if args.output is None:
         output_dir = Path(__file__).parent.parent / "output"
-        output_dir.mkdir(exist_ok=True)
+        if not output_dir.is_dir():
+            output_dir.mkdir(parents=True)
         args.output = str(output_dir / f"credit_strategy_S{args.semester}.xlsx")
 
-    # Fetch modules for timeline
-    modules = api.fetch_all_modules(args.semester)
-
-    if not modules:
-        print(f"\nNo modules found for semester {args.semester}")
-        sys.exit(0)
-
     # Generate Excel
-    generate_excel(modules, args.output, args.semester, user_info, year_credits_data, semester_year)
+    generate_excel(
+        modules, args.output, args.semester, user_info, year_credits_data, semester_year,
+        verbose=not args.quiet
+    )
 
-    print("\n" + "=" * 60)
-    print("Done!")
-    print(f"  - {len(modules)} modules exported")
-    print(f"  - File: {args.output}")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("Done!")
+    log(f"  - {len(modules)} modules exported")
+    log(f"  - File: {args.output}")
+    log("=" * 60)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,42 @@
 """Epitech Intranet API client."""
 
+import re
+import sys
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
+from functools import lru_cache
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
-from .config import BASE_URL, MODULES_ENDPOINT, REQUEST_HEADERS
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson is an optional speedup
+    from json import loads as _loads
+
+from .cache import ResponseCache
+from .config import BASE_URL, CACHE_DIR, CACHE_TTL, MAX_WORKERS, MODULES_ENDPOINT, REQUEST_HEADERS
 from .models import Activity, Module, UserInfo
 
 
+# Fields fetch_semester_credits reads from a module summary
+_SUMMARY_FIELDS = {"student_registered", "student_credits", "credits"}
+
+# "YYYY-MM-DD" with an optional " HH:MM:SS" time part
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2}):(\d{2}))?$")
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str | None) -> datetime | None:
     """Parse a date string from the API.
 
+    Results are memoized: activities of a module often share the same
+    timestamps, and datetime objects are immutable so they can be shared.
+
     Args:
         date_str: Date string in format "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS"
 
@@ -21,74 +46,164 @@ def parse_date(date_str: str | None) -> datetime | None:
     if not date_str:
         return None
 
-    for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-    return None
+    match = _DATE_RE.match(date_str)
+    if not match:
+        return None
+
+    year, month, day, hour, minute, second = match.groups()
+    try:
+        return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0))
+    except ValueError:
+        return None
+
+
+def _is_listed_unregistered(raw: dict) -> bool:
+    """Check whether a modules list entry says the student is not registered.
+
+    Args:
+        raw: Raw module dictionary from the modules list
+
+    Returns:
+        True only if the entry carries a registration status of "notregistered"
+    """
+    return raw.get("status") == "notregistered"
+
+
+def _wait_with_progress(futures: list[Future]):
+    """Wait for futures while redrawing one progress line, at most 10 times a second."""
+    total = len(futures)
+    last_draw = 0.0
+    for done, _ in enumerate(as_completed(futures), 1):
+        now = time.monotonic()
+        if done == total or now - last_draw >= 0.1:
+            sys.stdout.write(f"\r  [{done}/{total}] details fetched")
+            sys.stdout.flush()
+            last_draw = now
+    if total:
+        sys.stdout.write("\n")
 
 
 class EpitechAPI:
     """Client for the Epitech Intranet API."""
 
-    def __init__(self, cookie: str, max_retries: int = 3, retry_delay: int = 2):
+    def __init__(
+        self,
+        cookie: str,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_workers: int = MAX_WORKERS,
+        use_cache: bool = True,
+        verbose: bool = True
+    ):
         """Initialize the API client.
 
         Args:
             cookie: Authentication cookie (full cookie string or just the user token)
-            max_retries: Number of retry attempts on failure
-            retry_delay: Base delay between retries in seconds
+            max_retries: Number of retry attempts on network errors, 429 and 5xx responses
+            backoff_factor: Base of the exponential delay between retries in seconds
+            max_workers: Number of module detail requests sent concurrently
+            use_cache: Reuse module details saved on disk by previous runs
+            verbose: Print progress messages (errors are always printed)
         """
         self.session = requests.Session()
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
-
-        # Handle both full cookie string and token-only input
+        # Retries happen inside urllib3 with jittered exponential backoff,
+        # honouring Retry-After. The last failed response is returned so
+        # _request can raise it as an HTTPError.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # Keep enough pooled connections for the concurrent detail fetches
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Shared by every fetch so worker threads are started only once
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._verbose = verbose
+        self._log = print if verbose else (lambda *a, **k: None)
+        self._modules_cache: list[dict] | None = None
+        self._relevant_cache: dict[int, list[dict]] = {}
+        self._details_futures: dict[tuple[int, str, str], Future] = {}
+        self._summary_futures: dict[tuple[int, str, str], Future] = {}
+        self._details_lock = threading.Lock()
+        self._summary_supported: bool | None = None
+
+        # Handle both full cookie string and token-only input. The string is
+        # split by hand since SimpleCookie rejects some browser cookie values.
         if "user=" in cookie:
-            self.session.headers.update({"Cookie": cookie})
+            for part in cookie.split(";"):
+                name, sep, value = part.strip().partition("=")
+                if sep:
+                    self.session.cookies.set(name, value)
         else:
-            self.session.headers.update({"Cookie": f"user={cookie}; gdpr=1"})
+            self.session.cookies.set("user", cookie)
+            self.session.cookies.set("gdpr", "1")
 
         self.session.headers.update(REQUEST_HEADERS)
 
-    def _request(self, url: str) -> requests.Response:
-        """Make an HTTP request with automatic retries."""
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.get(url, timeout=30)
-
-                if response.status_code == 503:
-                    if attempt < self.max_retries - 1:
-                        print(f"\n  Server unavailable, retry {attempt + 2}/{self.max_retries}...", end="", flush=True)
-                        time.sleep(self.retry_delay * (attempt + 1))
-                        continue
-
-                response.raise_for_status()
-                return response
-
-            except requests.exceptions.RequestException:
-                if attempt < self.max_retries - 1:
-                    print(f"\n  Network error, retry {attempt + 2}/{self.max_retries}...", end="", flush=True)
-                    time.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    raise
+        # Entries are keyed by the user token only, so consent or tracking
+        # cookies changing between runs do not orphan the cached files
+        self._details_cache: ResponseCache | None = None
+        if use_cache:
+            self._details_cache = ResponseCache(
+                CACHE_DIR, CACHE_TTL, namespace=self.session.cookies.get("user") or cookie
+            )
+            self._details_cache.prune()
+
+    def invalidate(self):
+        """Drop in-memory cached responses so the next call refetches them."""
+        self._modules_cache = None
+        self._relevant_cache.clear()
+        with self._details_lock:
+            self._details_futures.clear()
+            self._summary_futures.clear()
+
+    def close(self):
+        """Release the worker threads and pooled connections.
+
+        Requests still queued are cancelled, so callers waiting on them
+        return right away.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
 
+    def _request(self, url: str, stream: bool = False) -> requests.Response:
+        """Make an HTTP request (retries are handled by the session adapter).
+
+        Args:
+            url: URL to fetch
+            stream: Leave the body unread so the caller can consume response.raw
+        """
+        response = self.session.get(url, timeout=30, stream=stream)
+        response.raise_for_status()
         return response
 
     def get_modules_list(self, semester: int | None = None) -> list[dict]:
         """Fetch the list of available modules.
 
+        The full catalog is downloaded once per client and filtered locally;
+        call invalidate() to force a refetch.
+
         Args:
             semester: Filter by semester number (optional)
 
         Returns:
             List of raw module dictionaries from the API
         """
-        url = f"{BASE_URL}{MODULES_ENDPOINT}"
-        response = self._request(url)
-        data = response.json()
-        modules = data.get("items", [])
+        if self._modules_cache is None:
+            url = f"{BASE_URL}{MODULES_ENDPOINT}"
+            # The catalog is the largest response: decode the raw body
+            # directly instead of buffering it through response.content
+            response = self._request(url, stream=True)
+            data = _loads(response.raw.read(decode_content=True))
+            self._modules_cache = data.get("items", [])
+
+        modules = self._modules_cache
 
         if semester is not None:
             modules = [m for m in modules if m.get("semester") == semester]
@@ -107,8 +222,49 @@ class EpitechAPI:
             Module details including activities
         """
         url = f"{BASE_URL}/module/{scolaryear}/{code}/{instance}/?format=json"
-        response = self._request(url)
-        return response.json()
+        return _loads(self._get_cached(url))
+
+    def get_module_summary(self, scolaryear: int, code: str, instance: str) -> dict:
+        """Fetch the registration and credit fields of a specific module.
+
+        Asks the module endpoint not to preload activities, which dominate the
+        payload. If the intranet answers 404 or omits the credit fields, this
+        falls back to get_module_details, and that outcome is remembered so
+        later calls go straight to the full details.
+
+        Args:
+            scolaryear: Academic year (e.g., 2024)
+            code: Module code (e.g., "G-AIA-400")
+            instance: Instance code (e.g., "LYN-4-1")
+
+        Returns:
+            Module data including at least student_registered, student_credits
+            and credits
+        """
+        if self._summary_supported is not False:
+            url = f"{BASE_URL}/module/{scolaryear}/{code}/{instance}/?format=json&preload=0"
+            try:
+                summary = _loads(self._get_cached(url))
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                summary = None
+
+            if isinstance(summary, dict) and _SUMMARY_FIELDS <= summary.keys():
+                self._summary_supported = True
+                return summary
+            self._summary_supported = False
+
+        return self.get_module_details(scolaryear, code, instance)
+
+    def _get_cached(self, url: str) -> bytes:
+        """Return a response body from the on-disk cache, fetching it if needed."""
+        content = self._details_cache.get(url) if self._details_cache else None
+        if content is None:
+            content = self._request(url).content
+            if self._details_cache:
+                self._details_cache.set(url, content)
+        return content
 
     def get_user_info(self) -> UserInfo:
         """Fetch current user profile information.
@@ -118,7 +274,7 @@ class EpitechAPI:
         """
         url = f"{BASE_URL}/user/?format=json"
         response = self._request(url)
-        data = response.json()
+        data = _loads(response.content)
 
         gpa_list = data.get("gpa", [])
         gpa = float(gpa_list[0].get("gpa", 0)) if gpa_list else 0.0
@@ -133,6 +289,100 @@ class EpitechAPI:
             gpa=gpa
         )
 
+    def _relevant_modules(self, semester: int) -> list[dict]:
+        """Return the Lyon campus modules of a semester that award credits.
+
+        The filtered list is cached per semester.
+
+        Args:
+            semester: Semester number
+
+        Returns:
+            List of raw module dictionaries from the API
+        """
+        if semester in self._relevant_cache:
+            return self._relevant_cache[semester]
+
+        relevant = []
+        for m in self.get_modules_list(semester):
+            try:
+                credits = int(m.get("credits") or 0)
+            except (TypeError, ValueError):
+                credits = 0
+
+            # Filter for Lyon campus with credits > 0
+            if m.get("instance_location") == "FR/LYN" and credits > 0:
+                relevant.append(m)
+
+        self._relevant_cache[semester] = relevant
+        return relevant
+
+    def _submit_module_details(self, raw: dict, summary: bool = False) -> Future:
+        """Schedule the details fetch of a module, at most once per client.
+
+        Args:
+            raw: Raw module dictionary from the modules list
+            summary: Only the credit fields are needed, so a module summary
+                will do unless full details are already fetched or in flight
+
+        Returns:
+            Future resolving to the module details (or summary)
+        """
+        key = (raw["scolaryear"], raw["code"], raw["codeinstance"])
+        with self._details_lock:
+            future = self._details_futures.get(key)
+            if future is None and summary:
+                future = self._summary_futures.get(key)
+                if future is None:
+                    future = self._executor.submit(self.get_module_summary, *key)
+                    self._summary_futures[key] = future
+            elif future is None:
+                future = self._executor.submit(self.get_module_details, *key)
+                self._details_futures[key] = future
+        return future
+
+    def _iter_module_details(
+        self,
+        semester: int,
+        registered_only: bool = False,
+        summary: bool = False,
+        progress: bool = False
+    ) -> list[tuple[dict, dict | Exception]]:
+        """Fetch the details of the relevant modules of a semester.
+
+        Details are fetched concurrently and memoized per module, so the
+        credit scan and the timeline share the same requests.
+
+        Args:
+            semester: Semester number
+            registered_only: Skip modules the modules list already reports as
+                not registered (entries without that information are kept)
+            summary: Accept module summaries instead of full details
+            progress: Show a single progress line while waiting (TTY only)
+
+        Returns:
+            List of (raw module, details) pairs in catalog order, where details
+            is the exception raised if the fetch failed
+        """
+        relevant = self._relevant_modules(semester)
+        if registered_only:
+            relevant = [m for m in relevant if not _is_listed_unregistered(m)]
+
+        futures = [self._submit_module_details(r, summary) for r in relevant]
+        if progress and sys.stdout.isatty():
+            _wait_with_progress(futures)
+        else:
+            wait(futures)
+
+        pairs = []
+        for raw, future in zip(relevant, futures):
+            try:
+                pairs.append((raw, future.result()))
+            except Exception as e:
+                pairs.append((raw, e))
+
+        return pairs
+
     def fetch_semester_credits(self, semester: int) -> dict:
         """Fetch credit summary for a semester (quick scan without activities).
 
@@ -146,28 +396,18 @@ class EpitechAPI:
             - 'innovation_pending': Innovation (G-INN) credits (registered, not validated)
             - 'innovation_validated': Innovation (G-INN) credits (validated)
         """
-        raw_modules = self.get_modules_list(semester)
-
-        # Filter for Lyon campus with credits > 0
-        relevant = [
-            m for m in raw_modules
-            if m.get("instance_location") == "FR/LYN"
-            and int(m.get("credits", 0)) > 0
-        ]
-
         pending = 0
         validated = 0
         innovation_pending = 0
         innovation_validated = 0
 
-        for raw in relevant:
-            code = raw["code"]
-            instance = raw["codeinstance"]
-            scolaryear = raw["scolaryear"]
-            is_innovation = code.startswith("G-INN")
+        # Only registered modules count, so skip the ones the list rules out
+        for raw, details in self._iter_module_details(semester, registered_only=True, summary=True):
+            if isinstance(details, Exception):
+                continue
+            is_innovation = raw["code"][:5] == "G-INN"
 
             try:
-                details = self.get_module_details(scolaryear, code, instance)
                 registered = details.get("student_registered", 0) == 1
                 student_credits = int(details.get("student_credits", 0) or 0)
                 module_credits = int(details.get("credits", 0))
@@ -202,74 +442,66 @@ class EpitechAPI:
         Returns:
             List of Module objects with populated activities
         """
-        print(f"Fetching modules for semester {semester}...")
+        return list(self.iter_modules(semester))
 
-        raw_modules = self.get_modules_list(semester)
+    def iter_modules(self, semester: int) -> Iterator[Module]:
+        """Yield the modules of a semester with their activities, one at a time.
 
-        # Filter for Lyon campus with credits > 0
-        relevant = [
-            m for m in raw_modules
-            if m.get("instance_location") == "FR/LYN"
-            and int(m.get("credits", 0)) > 0
-        ]
-
-        print(f"  {len(relevant)} modules found with credits")
-
-        modules = []
-        for i, raw in enumerate(relevant, 1):
-            code = raw["code"]
-            instance = raw["codeinstance"]
-            scolaryear = raw["scolaryear"]
+        Args:
+            semester: Semester number to fetch
 
-            print(f"  [{i}/{len(relevant)}] {raw['title']}...", end=" ", flush=True)
+        Yields:
+            Module objects with populated activities
+        """
+        self._log(f"\nFetching modules for semester {semester}...")
+        self._log(f"  {len(self._relevant_modules(semester))} modules found with credits")
 
+        loaded = 0
+        registered_count = 0
+        for raw, details in self._iter_module_details(semester, progress=self._verbose):
             try:
-                details = self.get_module_details(scolaryear, code, instance)
-
-                activities = []
-                for act in details.get("activites", []):
-                    begin = parse_date(act.get("begin") or act.get("start"))
-                    end = parse_date(act.get("end"))
-
-                    if begin and end:
-                        activities.append(Activity(
-                            title=act.get("title", ""),
-                            type_title=act.get("type_title", ""),
-                            begin=begin,
-                            end=end,
-                            module_title=details.get("title", "")
-                        ))
+                if isinstance(details, Exception):
+                    raise details
+
+                # Keep only activities with both a start and an end date
+                module_title = details.get("title", "")
+                activities = [
+                    Activity(
+                        title=act.get("title", ""),
+                        type_title=act.get("type_title", ""),
+                        begin=begin,
+                        end=end,
+                        module_title=module_title
+                    )
+                    for act in details.get("activites", [])
+                    if (begin := parse_date(act.get("begin") or act.get("start")))
+                    and (end := parse_date(act.get("end")))
+                ]
 
                 registered = details.get("student_registered", 0) == 1
                 student_credits = int(details.get("student_credits", 0) or 0)
 
                 module = Module(
                     id=raw["id"],
-                    code=code,
-                    instance=instance,
+                    code=raw["code"],
+                    instance=raw["codeinstance"],
                     title=details.get("title", raw["title"]),
                     credits=int(details.get("credits", 0)),
                     semester=semester,
                     begin=parse_date(details.get("begin")),
                     end=parse_date(details.get("end")),
-                    scolaryear=scolaryear,
+                    scolaryear=raw["scolaryear"],
                     activities=activities,
                     registered=registered,
                     student_credits=student_credits
                 )
-                modules.append(module)
-
-                # Show status: registered + pending or validated
-                if registered:
-                    if student_credits > 0:
-                        status = f" [+{student_credits} validated]"
-                    else:
-                        status = " [pending]"
-                else:
-                    status = ""
-                print(f"OK ({len(activities)} activities){status}")
 
             except Exception as e:
-                print(f"ERROR: {e}")
+                print(f"  {raw['title']}: ERROR: {e}")
+                continue
 
-        return modules
+            loaded += 1
+            registered_count += registered
+            yield module
+
+        self._log(f"  {loaded} modules loaded ({registered_count} registered)")
@@ -0,0 +1,76 @@
+"""On-disk cache for Epitech Intranet API responses."""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class ResponseCache:
+    """Stores raw response bodies on disk, one file per key, with a time-to-live."""
+
+    def __init__(self, directory: Path, ttl: int, namespace: str = ""):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached bodies
+            ttl: Maximum age of an entry in seconds
+            namespace: Salt mixed into every key (e.g., the session cookie) so
+                different users never read each other's entries
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self._namespace = namespace
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(f"{self._namespace}\0{key}".encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for a key, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink()
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def prune(self):
+        """Delete every expired entry.
+
+        This covers entries written for other sessions and temporary files
+        left behind by interrupted writes.
+        """
+        cutoff = time.time() - self.ttl
+        try:
+            entries = list(self.directory.iterdir())
+        except OSError:
+            return
+        for path in entries:
+            if path.suffix not in (".json", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def set(self, key: str, content: bytes):
+        """Store a body for a key. Write failures are ignored."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        try:
+            # Entries hold registration and credit data: keep them private
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
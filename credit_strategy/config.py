@@ -1,5 +1,9 @@
 """Configuration constants for the Credit Strategy tool."""
 
+import os
+import sys
+from pathlib import Path
+
 BASE_URL = "https://intra.epitech.eu"
 
 MODULES_ENDPOINT = (
@@ -9,6 +13,13 @@ MODULES_ENDPOINT = (
     "&scolaryear%5B%5D=2024&scolaryear%5B%5D=2025"
 )
 
+# Number of module detail requests sent concurrently
+MAX_WORKERS = 16
+
+# On-disk cache for module details (seconds before an entry is refetched)
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "credit_strategy"
+CACHE_TTL = 6 * 60 * 60
+
 # Module categories with their display name and color
 MODULE_CATEGORIES = {
     "G-AIA": ("AI & Machine Learning", "C6EFCE"),
@@ -57,7 +68,8 @@ MODULE_COLORS = [
 REQUEST_HEADERS = {
     "Accept": "application/json, text/javascript, */*; q=0.01",
     "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
-    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36"
@@ -71,3 +83,12 @@ REQUEST_HEADERS = {
     "Sec-Fetch-Mode": "cors",
     "Sec-Fetch-Site": "same-origin",
 }
+
+
+# Category prefixes are the first 5 characters of a module code ("G-AIA-400")
+_PREFIX_MAP = {sys.intern(prefix): info for prefix, info in MODULE_CATEGORIES.items()}
+
+
+def category_for(code: str) -> tuple[str, str] | None:
+    """Look up the (name, color) category of a module code by its prefix."""
+    return _PREFIX_MAP.get(code[:5])
@@ -1,15 +1,69 @@
 """Excel timeline generation for credit strategy visualization."""
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import cycle
+from operator import itemgetter
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
-from .config import MODULE_CATEGORIES, MODULE_COLORS
+from .config import MODULE_COLORS, category_for
 from .models import Module, UserInfo
 
 
+@lru_cache(maxsize=None)
+def _font(size: float | None = None, bold: bool = False, italic: bool = False, color: str | None = None) -> Font:
+    """Return a shared Font so identical styles are only built once."""
+    return Font(size=size, bold=bold, italic=italic, color=color)
+
+
+@lru_cache(maxsize=None)
+def _fill(hex_color: str) -> PatternFill:
+    """Return a shared solid PatternFill for a hex color."""
+    return PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
+
+
+@lru_cache(maxsize=None)
+def _border(color: str = "D9D9D9") -> Border:
+    """Return a shared thin Border on all four sides."""
+    side = Side(style='thin', color=color)
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+@lru_cache(maxsize=None)
+def _align(horizontal: str, vertical: str = 'center', wrap_text: bool = False) -> Alignment:
+    """Return a shared Alignment."""
+    return Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+
+
+# Sort key for modules without a start date
+_FAR_FUTURE = datetime.max
+
+ONE_WEEK = timedelta(days=7)
+WEEK_SPAN = timedelta(days=6)  # Monday to Sunday, as in get_week_range
+
+# Styles used on every sheet
+HEADER_FILL = _fill("5B9BD5")
+HEADER_FONT = _font(bold=True, size=10, color="FFFFFF")
+WEEK_FILL = _fill("F2F2F2")
+WEEK_FONT = _font(size=8, color="666666")
+LIGHT_BORDER = _border()
+CENTER_ALIGN = _align('center', 'center', True)
+LEFT_ALIGN = _align('left', 'center', True)
+RIGHT_ALIGN = _align('right', 'center')
+NAME_FONT_REG = _font(size=9, bold=True)
+NAME_FONT_UNREG = _font(size=9, color="999999")
+PROJ_FONT_REG = _font(size=7, bold=True)
+PROJ_FONT_UNREG = _font(size=7, color="888888")
+
+# Alternating summary row colors (white, very light gray)
+SUMMARY_FILLS = (_fill("FFFFFF"), _fill("F8F9FA"))
+
+
+@lru_cache(maxsize=256)
 def lighten_color(hex_color: str, factor: float = 0.6) -> str:
     """Lighten a hex color by blending with white.
 
@@ -20,18 +74,23 @@ def lighten_color(hex_color: str, factor: float = 0.6) -> str:
     Returns:
         Lightened hex color string
     """
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
+    value = int(hex_color, 16)
+    r = (value >> 16) & 0xFF
+    g = (value >> 8) & 0xFF
+    b = value & 0xFF
 
-    r = int(r + (255 - r) * factor)
-    g = int(g + (255 - g) * factor)
-    b = int(b + (255 - b) * factor)
+    r += int((255 - r) * factor)
+    g += int((255 - g) * factor)
+    b += int((255 - b) * factor)
 
     return f"{r:02X}{g:02X}{b:02X}"
 
 
-def get_week_range(start_date: datetime, end_date: datetime) -> list[tuple[datetime, datetime]]:
+# (vivid, faded) color pairs for registered / unregistered modules
+_PALETTE = [(color, lighten_color(color, 0.5)) for color in MODULE_COLORS]
+
+
+def get_week_range(start_date: datetime, end_date: datetime) -> list[tuple[datetime, datetime, str, str]]:
     """Generate list of week tuples between two dates.
 
     Args:
@@ -39,7 +98,7 @@ def get_week_range(start_date: datetime, end_date: datetime) -> list[tuple[datet
         end_date: End of the period
 
     Returns:
-        List of (week_start, week_end) tuples
+        List of (week_start, week_end, "dd/mm" label, "Mon YYYY" month) tuples
     """
     weeks = []
     current = start_date - timedelta(days=start_date.weekday())  # Start from Monday
@@ -47,12 +106,19 @@ def get_week_range(start_date: datetime, end_date: datetime) -> list[tuple[datet
     while current <= end_date:
         week_start = current
         week_end = current + timedelta(days=6)
-        weeks.append((week_start, week_end))
+        weeks.append((week_start, week_end, week_start.strftime('%d/%m'), week_start.strftime("%b %Y")))
         current += timedelta(days=7)
 
     return weeks
 
 
+@lru_cache(maxsize=256)
+def _is_project_type(type_title: str) -> bool:
+    """Check whether an activity type is a project (there are few distinct types)."""
+    return type_title == "Project" or "proj" in type_title.lower()
+
+
+@lru_cache(maxsize=None)
 def get_category_info(code: str) -> tuple[str, str]:
     """Get category name and color for a module code.
 
@@ -62,10 +128,38 @@ def get_category_info(code: str) -> tuple[str, str]:
     Returns:
         Tuple of (category_name, hex_color)
     """
-    for prefix, (name, color) in MODULE_CATEGORIES.items():
-        if code.startswith(prefix):
-            return name, color
-    return "Other", "FFFFFF"
+    return category_for(code) or ("Other", "FFFFFF")
+
+
+def _cell(
+    ws,
+    value=None,
+    font: Font | None = None,
+    fill: PatternFill | None = None,
+    border: Border | None = None,
+    alignment: Alignment | None = None
+) -> WriteOnlyCell:
+    """Create a styled cell for a write-only worksheet."""
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if border is not None:
+        cell.border = border
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def _styled_cells(
+    ws,
+    count: int,
+    fill: PatternFill | None = None,
+    border: Border | None = None
+) -> list[WriteOnlyCell]:
+    """Create a run of empty cells sharing the same fill and border."""
+    return [_cell(ws, fill=fill, border=border) for _ in range(count)]
 
 
 def generate_excel(
@@ -74,7 +168,8 @@ def generate_excel(
     semester: int,
     user_info: UserInfo | None = None,
     year_credits: dict[int, dict] | None = None,
-    semester_year: int | None = None
+    semester_year: int | None = None,
+    verbose: bool = True
 ):
     """Generate the Excel file with Gantt timeline.
 
@@ -85,12 +180,14 @@ def generate_excel(
         user_info: Optional user profile information
         year_credits: Optional dict of semester -> {pending, validated} credits
         semester_year: Academic year for the semester (calculated from semester number)
+        verbose: Print progress messages
     """
-    print(f"\nGenerating Excel file: {output_path}")
+    log = print if verbose else (lambda *a, **k: None)
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"Semester {semester}"
+    log(f"\nGenerating Excel file: {output_path}")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(f"Semester {semester}")
 
     if not modules:
         print("No modules to display")
@@ -98,298 +195,316 @@ def generate_excel(
 
     # Filter to keep only Project activities
     for module in modules:
-        module.activities = [
-            act for act in module.activities
-            if act.type_title == "Project" or "proj" in act.type_title.lower()
-        ]
+        module.activities = [act for act in module.activities if _is_project_type(act.type_title)]
 
     # Calculate date range from activities only
-    all_dates = []
+    min_date = max_date = None
     for module in modules:
         for act in module.activities:
-            all_dates.extend([act.begin, act.end])
+            for date in (act.begin, act.end):
+                if min_date is None or date < min_date:
+                    min_date = date
+                if max_date is None or date > max_date:
+                    max_date = date
 
     # Fallback to module dates if no activities
-    if not all_dates:
+    if min_date is None:
         for module in modules:
-            if module.begin:
-                all_dates.append(module.begin)
-            if module.end:
-                all_dates.append(module.end)
-
-    if not all_dates:
+            for date in (module.begin, module.end):
+                if not date:
+                    continue
+                if min_date is None or date < min_date:
+                    min_date = date
+                if max_date is None or date > max_date:
+                    max_date = date
+
+    if min_date is None:
         print("No dates found")
         return
-
-    min_date = min(all_dates)
-    max_date = max(all_dates)
     weeks = get_week_range(min_date, max_date)
 
-    print(f"  Period: {min_date.strftime('%d/%m/%Y')} - {max_date.strftime('%d/%m/%Y')}")
-    print(f"  {len(weeks)} weeks, {len(modules)} modules")
-
-    # Styles
-    header_fill = PatternFill(start_color="5B9BD5", end_color="5B9BD5", fill_type="solid")
-    header_font = Font(bold=True, size=10, color="FFFFFF")
-    light_border = Border(
-        left=Side(style='thin', color='D9D9D9'),
-        right=Side(style='thin', color='D9D9D9'),
-        top=Side(style='thin', color='D9D9D9'),
-        bottom=Side(style='thin', color='D9D9D9')
-    )
-    center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    left_align = Alignment(horizontal='left', vertical='center', wrap_text=True)
-
-    # Header: Module column
-    cell = ws.cell(row=1, column=1, value="Module")
-    cell.font = header_font
-    cell.fill = header_fill
-    cell.border = light_border
-    cell.alignment = center_align
-    ws.merge_cells(start_row=1, start_column=1, end_row=2, end_column=1)
-
-    # Header: Week columns with month grouping
+    log(f"  Period: {min_date.strftime('%d/%m/%Y')} - {max_date.strftime('%d/%m/%Y')}")
+    log(f"  {len(weeks)} weeks, {len(modules)} modules")
+
+    credits_col = len(weeks) + 2
+    reg_col = credits_col + 1
+
+    # Column letters, indexed by column number - 1
+    letters = [get_column_letter(col) for col in range(1, reg_col + 1)]
+    credits_letter = letters[credits_col - 1]
+    reg_letter = letters[reg_col - 1]
+
+    # Write-only sheets stream rows to disk as they are appended, so column
+    # widths, frozen panes and merges must be declared before the first row
+    ws.column_dimensions['A'].width = 28
+    for letter in letters[1:credits_col - 1]:
+        ws.column_dimensions[letter].width = 5.5
+    ws.column_dimensions[credits_letter].width = 7
+    ws.column_dimensions[reg_letter].width = 5
+    ws.freeze_panes = 'B3'
+
+    # Body rows use one sheet-wide default height; the two header rows keep
+    # Excel's standard height
+    ws.sheet_format.defaultRowHeight = 18
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+    ws.row_dimensions[2].height = 15
+
+    written_rows = 0
+
+    def write_row(row_num: int, cells: list):
+        """Append a row, padding with empty rows up to row_num (1-based)."""
+        nonlocal written_rows
+        while written_rows < row_num:
+            written_rows += 1
+            ws.append(cells if written_rows == row_num else [])
+
+    def filled_row(fill: PatternFill) -> list[WriteOnlyCell]:
+        """Build a row of bordered cells sharing one background fill."""
+        return _styled_cells(ws, reg_col, fill, LIGHT_BORDER)
+
+    # Header row 1: Module, month names (merged per month), Credits, Reg.
+    # Header row 2: week start dates
+    header_row = [_cell(ws, "Module", HEADER_FONT, HEADER_FILL, LIGHT_BORDER, CENTER_ALIGN)]
+    dates_row = [_cell(ws, border=LIGHT_BORDER)]
+    ws.merged_cells.add("A1:A2")
+
     current_month = None
     month_start_col = 2
 
-    for col, (week_start, _) in enumerate(weeks, start=2):
-        # Row 2: Week dates
-        cell = ws.cell(row=2, column=col, value=week_start.strftime('%d/%m'))
-        cell.font = Font(size=8, color="666666")
-        cell.alignment = center_align
-        cell.border = light_border
-        cell.fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+    for col, (_, _, week_label, month_name) in enumerate(weeks, start=2):
+        dates_row.append(_cell(ws, week_label, WEEK_FONT, WEEK_FILL, LIGHT_BORDER, CENTER_ALIGN))
 
-        # Row 1: Month names (merged)
-        month_name = week_start.strftime("%b %Y")
         if month_name != current_month:
-            if current_month is not None and col > 2:
-                ws.merge_cells(start_row=1, start_column=month_start_col, end_row=1, end_column=col-1)
+            if current_month is not None and col - 1 > month_start_col:
+                ws.merged_cells.add(f"{letters[month_start_col - 1]}1:{letters[col - 2]}1")
             current_month = month_name
             month_start_col = col
-
-        cell = ws.cell(row=1, column=col, value=month_name)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
-        cell.border = light_border
+            header_row.append(_cell(ws, month_name, HEADER_FONT, HEADER_FILL, LIGHT_BORDER, CENTER_ALIGN))
+        else:
+            header_row.append(_cell(ws, border=LIGHT_BORDER))
 
     # Merge last month
-    if month_start_col <= len(weeks) + 1:
-        ws.merge_cells(start_row=1, start_column=month_start_col, end_row=1, end_column=len(weeks)+1)
+    if len(weeks) + 1 > month_start_col:
+        ws.merged_cells.add(f"{letters[month_start_col - 1]}1:{letters[len(weeks)]}1")
 
-    # Header: Credits column
-    credits_col = len(weeks) + 2
-    cell = ws.cell(row=1, column=credits_col, value="Credits")
-    cell.font = header_font
-    cell.fill = header_fill
-    cell.border = light_border
-    cell.alignment = center_align
-    ws.merge_cells(start_row=1, start_column=credits_col, end_row=2, end_column=credits_col)
-
-    # Header: Registered column
-    reg_col = credits_col + 1
-    cell = ws.cell(row=1, column=reg_col, value="Reg.")
-    cell.font = header_font
-    cell.fill = header_fill
-    cell.border = light_border
-    cell.alignment = center_align
-    ws.merge_cells(start_row=1, start_column=reg_col, end_row=2, end_column=reg_col)
+    # Header: Credits and Registered columns
+    for title, col in (("Credits", credits_col), ("Reg.", reg_col)):
+        header_row.append(_cell(ws, title, HEADER_FONT, HEADER_FILL, LIGHT_BORDER, CENTER_ALIGN))
+        dates_row.append(_cell(ws, border=LIGHT_BORDER))
+        ws.merged_cells.add(f"{letters[col - 1]}1:{letters[col - 1]}2")
+
+    write_row(1, header_row)
+    write_row(2, dates_row)
 
     # Separate Innovation modules (bonus credits)
     innovation_modules = [m for m in modules if m.code.startswith("G-INN")]
     regular_modules = [m for m in modules if not m.code.startswith("G-INN")]
 
     # Sort by category then by start date
-    regular_modules.sort(key=lambda m: (get_category_info(m.code)[0], m.begin or datetime.max))
+    cat_by_code = {m.code: get_category_info(m.code) for m in regular_modules}
+    decorated = [((cat_by_code[m.code][0], m.begin or _FAR_FUTURE), m) for m in regular_modules]
+    decorated.sort(key=itemgetter(0))
+    regular_modules = [m for _, m in decorated]
 
     # Write module rows
+    n_weeks = len(weeks)
+    first_week = weeks[0][0]
+    title_prefix = f"G{semester} - "
     row = 3
     current_category = None
     color_index = 0
     first_data_row = row
 
     for module in regular_modules:
-        category_name, _ = get_category_info(module.code)
+        registered = module.registered
+        category_name, _ = cat_by_code[module.code]
 
         # Category separator row
         if category_name != current_category:
             current_category = category_name
-            cell = ws.cell(row=row, column=1, value=f"  {category_name}")
-            cell.font = Font(bold=True, size=9, italic=True, color="666666")
-            cat_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-            for col in range(1, reg_col + 1):
-                ws.cell(row=row, column=col).fill = cat_fill
-                ws.cell(row=row, column=col).border = light_border
+            cat_fill = _fill("E7E6E6")
+            cells = filled_row(cat_fill)
+            cells[0].value = f"  {category_name}"
+            cells[0].font = _font(bold=True, size=9, italic=True, color="666666")
+            write_row(row, cells)
             row += 1
 
         # Module color - vivid for registered, faded for not registered
-        base_color = MODULE_COLORS[color_index % len(MODULE_COLORS)]
+        vivid, faded = _PALETTE[color_index % len(_PALETTE)]
         color_index += 1
 
-        if module.registered:
-            module_color = base_color
-            name_font = Font(size=9, bold=True)
+        if registered:
+            module_color = vivid
+            name_font = NAME_FONT_REG
+            proj_font = PROJ_FONT_REG
         else:
-            module_color = lighten_color(base_color, 0.5)
-            name_font = Font(size=9, color="999999")
+            module_color = faded
+            name_font = NAME_FONT_UNREG
+            proj_font = PROJ_FONT_UNREG
 
-        module_fill = PatternFill(start_color=module_color, end_color=module_color, fill_type="solid")
+        module_fill = _fill(module_color)
 
         # Module name (simplified)
-        module_name = module.title.replace(f"G{semester} - ", "")
-        cell = ws.cell(row=row, column=1, value=module_name)
-        cell.border = light_border
-        cell.alignment = left_align
-        cell.font = name_font
+        module_name = module.title.removeprefix(title_prefix)
+        cells = [_cell(ws, module_name, name_font, border=LIGHT_BORDER, alignment=LEFT_ALIGN)]
+
+        # Map each activity to the weeks it overlaps; the first activity
+        # (in list order) covering a week owns it
+        owners = [None] * n_weeks
+        for act in module.activities:
+            start = max(0, -((first_week + WEEK_SPAN - act.begin) // ONE_WEEK))
+            end = min(n_weeks - 1, (act.end - first_week) // ONE_WEEK)
+            for wi in range(start, end + 1):
+                if owners[wi] is None:
+                    owners[wi] = act
 
         # Fill week cells with project bars
-        for col, (week_start, week_end) in enumerate(weeks, start=2):
-            cell = ws.cell(row=row, column=col)
-            cell.border = light_border
-
-            for act in module.activities:
-                if week_start <= act.end and week_end >= act.begin:
-                    cell.fill = module_fill
-
-                    # Show project name at start of period
-                    if week_start <= act.begin <= week_end:
-                        proj_name = act.title.split(" - ")[-1] if " - " in act.title else act.title
-                        cell.value = proj_name[:10]
-                        if module.registered:
-                            cell.font = Font(size=7, bold=True)
-                        else:
-                            cell.font = Font(size=7, color="888888")
-                        cell.alignment = center_align
-                    break
+        week_cells = _styled_cells(ws, n_weeks, border=LIGHT_BORDER)
+        for cell, (week_start, *_), act in zip(week_cells, weeks, owners):
+            if act is not None:
+                cell.fill = module_fill
+
+                # Show project name at start of period
+                if week_start <= act.begin:
+                    title = act.title
+                    proj_name = title.split(" - ")[-1] if " - " in title else title
+                    cell.value = proj_name[:10]
+                    cell.font = proj_font
+                    cell.alignment = CENTER_ALIGN
+
+        cells.extend(week_cells)
 
         # Credits cell
-        cell = ws.cell(row=row, column=credits_col, value=module.credits)
-        cell.border = light_border
-        cell.alignment = center_align
-        cell.font = Font(bold=True)
+        cells.append(_cell(ws, module.credits, _font(bold=True), border=LIGHT_BORDER, alignment=CENTER_ALIGN))
 
         # Registered cell
-        cell = ws.cell(row=row, column=reg_col)
-        cell.border = light_border
-        cell.alignment = center_align
-        if module.registered:
-            cell.value = "✓"
-            cell.font = Font(bold=True, color="228B22", size=12)
-            cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
+        if registered:
+            cells.append(_cell(
+                ws, "✓", _font(bold=True, color="228B22", size=12),
+                _fill("D4EDDA"),
+                LIGHT_BORDER, CENTER_ALIGN
+            ))
+        else:
+            cells.append(_cell(ws, border=LIGHT_BORDER, alignment=CENTER_ALIGN))
 
+        write_row(row, cells)
         row += 1
 
     last_data_row = row - 1
 
     # Total available credits
     row += 1
-    ws.cell(row=row, column=1, value="TOTAL AVAILABLE").font = Font(bold=True, size=10)
-    cell = ws.cell(row=row, column=credits_col)
-    cell.font = Font(bold=True, size=10)
-    cell.value = f"=SUM({get_column_letter(credits_col)}{first_data_row}:{get_column_letter(credits_col)}{last_data_row})"
-    cell.alignment = center_align
+    cells = [None] * reg_col
+    cells[0] = _cell(ws, "TOTAL AVAILABLE", _font(bold=True, size=10))
+    cells[credits_col - 1] = _cell(
+        ws,
+        f"=SUM({credits_letter}{first_data_row}:{credits_letter}{last_data_row})",
+        _font(bold=True, size=10),
+        alignment=CENTER_ALIGN
+    )
+    write_row(row, cells)
 
     # Total registered credits
     row += 1
-    ws.cell(row=row, column=1, value="TOTAL REGISTERED").font = Font(bold=True, size=10, color="228B22")
-    cell = ws.cell(row=row, column=credits_col)
-    cell.font = Font(bold=True, size=10, color="228B22")
-    cell.value = f'=SUMIF({get_column_letter(reg_col)}{first_data_row}:{get_column_letter(reg_col)}{last_data_row},"✓",{get_column_letter(credits_col)}{first_data_row}:{get_column_letter(credits_col)}{last_data_row})'
-    cell.alignment = center_align
+    cells = [None] * reg_col
+    cells[0] = _cell(ws, "TOTAL REGISTERED", _font(bold=True, size=10, color="228B22"))
+    cells[credits_col - 1] = _cell(
+        ws,
+        f'=SUMIF({reg_letter}{first_data_row}:{reg_letter}{last_data_row},"✓",{credits_letter}{first_data_row}:{credits_letter}{last_data_row})',
+        _font(bold=True, size=10, color="228B22"),
+        alignment=CENTER_ALIGN
+    )
+    write_row(row, cells)
 
     # Innovation section (bonus credits)
     if innovation_modules:
         row += 2
 
         # Innovation header
-        cell = ws.cell(row=row, column=1, value="  INNOVATION (Bonus credits)")
-        cell.font = Font(bold=True, size=9, italic=True, color="9966FF")
-        bonus_fill = PatternFill(start_color="F3E5F5", end_color="F3E5F5", fill_type="solid")
-        for col in range(1, reg_col + 1):
-            ws.cell(row=row, column=col).fill = bonus_fill
-            ws.cell(row=row, column=col).border = light_border
+        bonus_fill = _fill("F3E5F5")
+        cells = filled_row(bonus_fill)
+        cells[0].value = "  INNOVATION (Bonus credits)"
+        cells[0].font = _font(bold=True, size=9, italic=True, color="9966FF")
+        write_row(row, cells)
         row += 1
 
         innovation_first_row = row
 
-        for module in innovation_modules:
-            module_fill = PatternFill(start_color="E1BEE7", end_color="E1BEE7", fill_type="solid")
+        # Innovation modules have no timeline bars. Appended cells are written
+        # out immediately, so the same empty bordered run serves every row.
+        empty_weeks = _styled_cells(ws, n_weeks, border=LIGHT_BORDER)
 
-            module_name = module.title.replace(f"G{semester} - ", "")
-            cell = ws.cell(row=row, column=1, value=module_name)
-            cell.border = light_border
-            cell.alignment = left_align
-            cell.font = Font(size=9, italic=True)
+        for module in innovation_modules:
+            module_name = module.title.removeprefix(title_prefix)
+            cells = [_cell(ws, module_name, _font(size=9, italic=True), border=LIGHT_BORDER, alignment=LEFT_ALIGN)]
 
-            for col in range(2, len(weeks) + 2):
-                ws.cell(row=row, column=col).border = light_border
+            cells.extend(empty_weeks)
 
-            cell = ws.cell(row=row, column=credits_col, value=module.credits)
-            cell.border = light_border
-            cell.alignment = center_align
-            cell.font = Font(italic=True, color="9966FF")
+            cells.append(_cell(
+                ws, module.credits, _font(italic=True, color="9966FF"),
+                border=LIGHT_BORDER, alignment=CENTER_ALIGN
+            ))
 
-            cell = ws.cell(row=row, column=reg_col)
-            cell.border = light_border
-            cell.alignment = center_align
             if module.registered:
-                cell.value = "✓"
-                cell.font = Font(bold=True, color="9966FF", size=12)
-                cell.fill = PatternFill(start_color="E8D5F0", end_color="E8D5F0", fill_type="solid")
-
+                cells.append(_cell(
+                    ws, "✓", _font(bold=True, color="9966FF", size=12),
+                    _fill("E8D5F0"),
+                    LIGHT_BORDER, CENTER_ALIGN
+                ))
+            else:
+                cells.append(_cell(ws, border=LIGHT_BORDER, alignment=CENTER_ALIGN))
+
+            write_row(row, cells)
             row += 1
 
         innovation_last_row = row - 1
 
         # Bonus total
         row += 1
-        ws.cell(row=row, column=1, value="TOTAL BONUS (if validated)").font = Font(bold=True, size=10, italic=True, color="9966FF")
-        cell = ws.cell(row=row, column=credits_col)
-        cell.font = Font(bold=True, size=10, italic=True, color="9966FF")
-        cell.value = f'=SUMIF({get_column_letter(reg_col)}{innovation_first_row}:{get_column_letter(reg_col)}{innovation_last_row},"✓",{get_column_letter(credits_col)}{innovation_first_row}:{get_column_letter(credits_col)}{innovation_last_row})'
-        cell.alignment = center_align
+        cells = [None] * reg_col
+        cells[0] = _cell(ws, "TOTAL BONUS (if validated)", _font(bold=True, size=10, italic=True, color="9966FF"))
+        cells[credits_col - 1] = _cell(
+            ws,
+            f'=SUMIF({reg_letter}{innovation_first_row}:{reg_letter}{innovation_last_row},"✓",{credits_letter}{innovation_first_row}:{credits_letter}{innovation_last_row})',
+            _font(bold=True, size=10, italic=True, color="9966FF"),
+            alignment=CENTER_ALIGN
+        )
+        write_row(row, cells)
 
     # User credit summary section
     if user_info and year_credits:
         row += 3
 
-        # Calculate totals from year credits data (regular modules only)
-        total_validated = sum(s.get("validated", 0) for s in year_credits.values())
-        total_pending = sum(s.get("pending", 0) for s in year_credits.values())
-
-        # Calculate innovation totals separately
-        total_innovation_validated = sum(s.get("innovation_validated", 0) for s in year_credits.values())
-        total_innovation_pending = sum(s.get("innovation_pending", 0) for s in year_credits.values())
-
-        # Alternating row colors (very light pastel)
-        row_color_1 = "FFFFFF"  # White
-        row_color_2 = "F8F9FA"  # Very light gray
-        summary_row_index = 0
-
-        def apply_row_style(row_num: int):
-            """Apply alternating background color to summary row."""
-            nonlocal summary_row_index
-            bg_color = row_color_1 if summary_row_index % 2 == 0 else row_color_2
-            fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
-            for col in range(1, reg_col + 1):
-                ws.cell(row=row_num, column=col).fill = fill
-                ws.cell(row=row_num, column=col).border = light_border
-            summary_row_index += 1
+        # Year totals are SUM formulas over the per-semester cells, so they
+        # stay correct if a semester value is edited in the sheet
+        validated_refs = []
+        pending_refs = []
+        inn_validated_refs = []
+        inn_pending_refs = []
+
+        row_fills = cycle(SUMMARY_FILLS)
+
+        def summary_row(label: str, label_font: Font, value, value_font: Font) -> list[WriteOnlyCell]:
+            """Build a summary row with alternating background color."""
+            cells = filled_row(next(row_fills))
+            cells[0].value = label
+            cells[0].font = label_font
+            cells[0].alignment = RIGHT_ALIGN
+            cells[credits_col - 1].value = value
+            cells[credits_col - 1].font = value_font
+            cells[credits_col - 1].alignment = CENTER_ALIGN
+            return cells
 
         # Header
-        summary_fill = PatternFill(start_color="2E75B6", end_color="2E75B6", fill_type="solid")
+        summary_fill = _fill("2E75B6")
         display_year = semester_year if semester_year else user_info.student_year
-        cell = ws.cell(row=row, column=1, value=f"CREDIT SUMMARY - Year {display_year}")
-        cell.font = Font(bold=True, size=10, color="FFFFFF")
-        for col in range(1, reg_col + 1):
-            ws.cell(row=row, column=col).fill = summary_fill
-            ws.cell(row=row, column=col).border = light_border
+        cells = filled_row(summary_fill)
+        cells[0].value = f"CREDIT SUMMARY - Year {display_year}"
+        cells[0].font = _font(bold=True, size=10, color="FFFFFF")
+        write_row(row, cells)
         row += 1
 
-        # Right-aligned labels for better readability
-        right_align = Alignment(horizontal='right', vertical='center')
-
         # Per-semester breakdown
         for sem_num in sorted(year_credits.keys()):
             sem_data = year_credits[sem_num]
@@ -399,138 +514,121 @@ def generate_excel(
             inn_pending = sem_data.get("innovation_pending", 0)
 
             # Semester header
-            cell = ws.cell(row=row, column=1, value=f"Semester {sem_num}")
-            cell.font = Font(bold=True, size=9, color="2E75B6")
-            cell.alignment = left_align
-            sem_header_fill = PatternFill(start_color="E8F0FE", end_color="E8F0FE", fill_type="solid")
-            for col in range(1, reg_col + 1):
-                ws.cell(row=row, column=col).fill = sem_header_fill
-                ws.cell(row=row, column=col).border = light_border
+            sem_header_fill = _fill("E8F0FE")
+            cells = filled_row(sem_header_fill)
+            cells[0].value = f"Semester {sem_num}"
+            cells[0].font = _font(bold=True, size=9, color="2E75B6")
+            cells[0].alignment = LEFT_ALIGN
+            write_row(row, cells)
             row += 1
-            summary_row_index = 0  # Reset alternating for each semester
+            row_fills = cycle(SUMMARY_FILLS)  # Reset alternating for each semester
 
             # Validated (projects)
-            cell = ws.cell(row=row, column=1, value="Validated (projects)")
-            cell.font = Font(size=9)
-            cell.alignment = right_align
-            apply_row_style(row)
-            cell = ws.cell(row=row, column=credits_col, value=validated)
-            cell.font = Font(bold=True, color="228B22")
-            cell.alignment = center_align
+            validated_refs.append(f"{credits_letter}{row}")
+            write_row(row, summary_row(
+                "Validated (projects)", _font(size=9),
+                validated, _font(bold=True, color="228B22")
+            ))
             row += 1
 
             # Pending (projects)
-            cell = ws.cell(row=row, column=1, value="Pending (projects)")
-            cell.font = Font(size=9)
-            cell.alignment = right_align
-            apply_row_style(row)
-            cell = ws.cell(row=row, column=credits_col, value=pending)
-            cell.font = Font(bold=True, color="FF8C00")
-            cell.alignment = center_align
+            pending_refs.append(f"{credits_letter}{row}")
+            write_row(row, summary_row(
+                "Pending (projects)", _font(size=9),
+                pending, _font(bold=True, color="FF8C00")
+            ))
             row += 1
 
             # Innovation validated (if any)
             if inn_validated > 0 or inn_pending > 0:
-                cell = ws.cell(row=row, column=1, value="Innovation validated (bonus)")
-                cell.font = Font(size=9, italic=True)
-                cell.alignment = right_align
-                apply_row_style(row)
-                cell = ws.cell(row=row, column=credits_col, value=inn_validated)
-                cell.font = Font(bold=True, color="9966FF", italic=True)
-                cell.alignment = center_align
+                inn_validated_refs.append(f"{credits_letter}{row}")
+                write_row(row, summary_row(
+                    "Innovation validated (bonus)", _font(size=9, italic=True),
+                    inn_validated, _font(bold=True, color="9966FF", italic=True)
+                ))
                 row += 1
 
                 # Innovation pending
-                cell = ws.cell(row=row, column=1, value="Innovation pending (bonus)")
-                cell.font = Font(size=9, italic=True)
-                cell.alignment = right_align
-                apply_row_style(row)
-                cell = ws.cell(row=row, column=credits_col, value=inn_pending)
-                cell.font = Font(bold=True, color="9966FF", italic=True)
-                cell.alignment = center_align
+                inn_pending_refs.append(f"{credits_letter}{row}")
+                write_row(row, summary_row(
+                    "Innovation pending (bonus)", _font(size=9, italic=True),
+                    inn_pending, _font(bold=True, color="9966FF", italic=True)
+                ))
                 row += 1
 
         # Year totals section
         row += 1
-        totals_header_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
-        cell = ws.cell(row=row, column=1, value="YEAR TOTALS")
-        cell.font = Font(bold=True, size=9, color="2E75B6")
-        for col in range(1, reg_col + 1):
-            ws.cell(row=row, column=col).fill = totals_header_fill
-            ws.cell(row=row, column=col).border = light_border
+        totals_header_fill = _fill("D9E2F3")
+        cells = filled_row(totals_header_fill)
+        cells[0].value = "YEAR TOTALS"
+        cells[0].font = _font(bold=True, size=9, color="2E75B6")
+        write_row(row, cells)
         row += 1
-        summary_row_index = 0
+        row_fills = cycle(SUMMARY_FILLS)
+
+        has_innovation = bool(inn_validated_refs)
 
         # Regular credits summary
         summary_items = [
-            ("Projects validated", total_validated, "228B22", False),
-            ("Projects pending", total_pending, "FF8C00", False),
+            ("validated", "Projects validated", f"=SUM({','.join(validated_refs)})", "228B22", False),
+            ("pending", "Projects pending", f"=SUM({','.join(pending_refs)})", "FF8C00", False),
         ]
 
         # Add innovation if any
-        if total_innovation_validated > 0 or total_innovation_pending > 0:
+        if has_innovation:
             summary_items.extend([
-                ("Innovation validated (bonus)", total_innovation_validated, "9966FF", True),
-                ("Innovation pending (bonus)", total_innovation_pending, "9966FF", True),
+                ("inn_validated", "Innovation validated (bonus)",
+                 f"=SUM({','.join(inn_validated_refs)})", "9966FF", True),
+                ("inn_pending", "Innovation pending (bonus)",
+                 f"=SUM({','.join(inn_pending_refs)})", "9966FF", True),
             ])
 
-        summary_items.extend([
-            ("Year goal", 60, "666666", False),
-            ("Remaining to goal", max(0, 60 - total_validated - total_pending), "C00000", False),
-        ])
+        summary_items.append(("goal", "Year goal", 60, "666666", False))
 
-        for label, value, color, is_italic in summary_items:
-            cell = ws.cell(row=row, column=1, value=label)
-            cell.font = Font(size=9, italic=is_italic)
-            cell.alignment = right_align
-            apply_row_style(row)
-
-            cell = ws.cell(row=row, column=credits_col, value=value)
-            cell.font = Font(bold=True, color=color, italic=is_italic)
-            cell.alignment = center_align
+        # Cell reference of each year total, for the formulas below
+        totals = {}
+        for key, label, value, color, is_italic in summary_items:
+            totals[key] = f"{credits_letter}{row}"
+            write_row(row, summary_row(
+                label, _font(size=9, italic=is_italic),
+                value, _font(bold=True, color=color, italic=is_italic)
+            ))
             row += 1
 
+        write_row(row, summary_row(
+            "Remaining to goal", _font(size=9),
+            f"=MAX(0,{totals['goal']}-{totals['validated']}-{totals['pending']})",
+            _font(bold=True, color="C00000")
+        ))
+        row += 1
+
         # Potential total (projects only - guaranteed)
         row += 1
-        potential_fill = PatternFill(start_color="E2F0D9", end_color="E2F0D9", fill_type="solid")
-        cell = ws.cell(row=row, column=1, value="POTENTIAL TOTAL (projects)")
-        cell.font = Font(bold=True, size=10)
-        cell.alignment = right_align
-        for col in range(1, reg_col + 1):
-            ws.cell(row=row, column=col).fill = potential_fill
-            ws.cell(row=row, column=col).border = light_border
-        cell = ws.cell(row=row, column=credits_col, value=total_validated + total_pending)
-        cell.font = Font(bold=True, size=11, color="228B22")
-        cell.alignment = center_align
+        potential_fill = _fill("E2F0D9")
+        cells = filled_row(potential_fill)
+        cells[0].value = "POTENTIAL TOTAL (projects)"
+        cells[0].font = _font(bold=True, size=10)
+        cells[0].alignment = RIGHT_ALIGN
+        cells[credits_col - 1].value = f"={totals['validated']}+{totals['pending']}"
+        cells[credits_col - 1].font = _font(bold=True, size=11, color="228B22")
+        cells[credits_col - 1].alignment = CENTER_ALIGN
+        write_row(row, cells)
 
         # With innovation (if any)
-        if total_innovation_validated > 0 or total_innovation_pending > 0:
+        if has_innovation:
             row += 1
-            bonus_fill = PatternFill(start_color="F3E5F5", end_color="F3E5F5", fill_type="solid")
-            cell = ws.cell(row=row, column=1, value="WITH INNOVATION (if validated)")
-            cell.font = Font(bold=True, size=10, italic=True)
-            cell.alignment = right_align
-            for col in range(1, reg_col + 1):
-                ws.cell(row=row, column=col).fill = bonus_fill
-                ws.cell(row=row, column=col).border = light_border
-            total_all = total_validated + total_pending + total_innovation_validated + total_innovation_pending
-            cell = ws.cell(row=row, column=credits_col, value=total_all)
-            cell.font = Font(bold=True, size=11, color="9966FF", italic=True)
-            cell.alignment = center_align
-
-    # Column widths
-    ws.column_dimensions['A'].width = 28
-    for col in range(2, len(weeks) + 2):
-        ws.column_dimensions[get_column_letter(col)].width = 5.5
-    ws.column_dimensions[get_column_letter(credits_col)].width = 7
-    ws.column_dimensions[get_column_letter(reg_col)].width = 5
-
-    # Freeze panes
-    ws.freeze_panes = 'B3'
-
-    # Row heights
-    for r in range(3, row + 1):
-        ws.row_dimensions[r].height = 18
+            bonus_fill = _fill("F3E5F5")
+            cells = filled_row(bonus_fill)
+            cells[0].value = "WITH INNOVATION (if validated)"
+            cells[0].font = _font(bold=True, size=10, italic=True)
+            cells[0].alignment = RIGHT_ALIGN
+            cells[credits_col - 1].value = (
+                f"={totals['validated']}+{totals['pending']}"
+                f"+{totals['inn_validated']}+{totals['inn_pending']}"
+            )
+            cells[credits_col - 1].font = _font(bold=True, size=11, color="9966FF", italic=True)
+            cells[credits_col - 1].alignment = CENTER_ALIGN
+            write_row(row, cells)
 
     wb.save(output_path)
-    print(f"  File saved: {output_path}")
+    log(f"  File saved: {output_path}")
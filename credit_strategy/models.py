@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Activity:
     """Represents a project/activity within a module."""
 
@@ -15,7 +15,7 @@ class Activity:
     module_title: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Module:
     """Represents an Epitech module with its metadata and activities."""
 